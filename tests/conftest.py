@@ -0,0 +1,310 @@
+"""
+Shared pytest fixtures for the docx-tex-validator test suite.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from docx_tex_validator import DocxValidator
+from docx_tex_validator.parsers import DocxParser, HTMLParser, LaTeXParser
+
+# Files inspected by the version consistency tests
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_CLI_PATH = _REPO_ROOT / "docx_tex_validator" / "cli.py"
+_DOCS_CONF_PATH = _REPO_ROOT / "docs" / "conf.py"
+_PYPROJECT_PATH = _REPO_ROOT / "pyproject.toml"
+
+# Sample documents written once per session for the parser tests
+HTML_SAMPLE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Test Document</title>
+        <meta name="author" content="Test Author">
+    </head>
+    <body>
+        <h1>Main Heading</h1>
+        <p>This is a paragraph.</p>
+        <h2>Subheading</h2>
+        <p>Another paragraph.</p>
+    </body>
+    </html>
+    """
+
+LATEX_SAMPLE = r"""
+    \documentclass{article}
+    \usepackage{amsmath}
+    \title{Test Document}
+    \author{Test Author}
+    \date{\today}
+
+    \begin{document}
+    \maketitle
+
+    \section{Introduction}
+    This is the introduction.
+
+    \subsection{Background}
+    Some background information.
+
+    \begin{figure}
+        \caption{A test figure}
+        \label{fig:test}
+    \end{figure}
+
+    \begin{equation}
+        E = mc^2
+        \label{eq:einstein}
+    \end{equation}
+
+    See Figure \ref{fig:test} and Equation \ref{eq:einstein}.
+
+    \cite{test2023}
+
+    \end{document}
+    """
+
+
+def _fake_response(data, messages=(), usage=None, metadata=None):
+    """Build a lightweight stand-in for an agent run result.
+
+    The validator reads ``data``, calls ``all_messages()`` and ``usage()``, and logs
+    ``metadata`` when it is truthy, so plain attributes and closures are sufficient.
+
+    Args:
+        data (str):
+            Response text returned by the model.
+
+    Keyword Parameters:
+        messages (Sequence[dict]):
+            Messages returned by ``all_messages()``.
+        usage (dict):
+            Token usage returned by ``usage()``.
+        metadata (dict):
+            Response metadata.
+
+    Returns:
+        (SimpleNamespace):
+            Object exposing the attributes the validator and backends read.
+    """
+    return SimpleNamespace(
+        data=data,
+        all_messages=lambda m=list(messages): m,
+        usage=lambda u=usage: u,
+        metadata=metadata or {},
+    )
+
+
+def _stub_parser(structure):
+    """Build a parser stand-in that returns a fixed structure without touching disk.
+
+    Args:
+        structure (Dict[str, Any]):
+            Document structure returned by ``parse``.
+
+    Returns:
+        (SimpleNamespace):
+            Object with a ``parse`` method like a real parser.
+    """
+    return SimpleNamespace(parse=lambda file_path: structure)
+
+
+def pytest_addoption(parser):
+    """Add the ``--run-slow`` command line option."""
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="Run tests marked as slow (those that construct LLM backends)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked as slow unless ``--run-slow`` was given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="Slow test: pass --run-slow to run it")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def openai_key(monkeypatch):
+    """Provide a dummy OPENAI_API_KEY for tests that construct a backend.
+
+    The variable is restored by monkeypatch when the test finishes, even on failure.
+    """
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key")
+
+
+@pytest.fixture(scope="module")
+def validator():
+    """Build a single DocxValidator shared by all tests in a module.
+
+    Constructing the backend and agent is comparatively expensive, so it is done once
+    per test module. The API key environment variable is restored afterwards.
+
+    Returns:
+        (DocxValidator):
+            Validator using the OpenAI backend with the gpt-4o model.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_API_KEY", "test_key")
+        yield DocxValidator(model_name="gpt-4o", api_key="test_key")
+
+
+@pytest.fixture
+def mock_backend(validator):
+    """Replace the shared validator's ``backend.run_sync`` with a fresh Mock for one test.
+
+    Returns:
+        (Mock):
+            The mock installed as ``validator.backend.run_sync``; configure its
+            ``return_value`` or ``side_effect`` in the test.
+    """
+    run_sync = Mock()
+    validator.backend.run_sync = run_sync
+    yield run_sync
+    # Drop the instance attribute so the real bound method is visible again
+    del validator.backend.run_sync
+
+
+@pytest.fixture(scope="session")
+def fake_response():
+    """Provide the agent run result builder used to stub ``backend.run_sync``.
+
+    Returns:
+        (Callable[..., SimpleNamespace]):
+            ``_fake_response``, taking the response data and optional ``messages``,
+            ``usage`` and ``metadata``.
+    """
+    return _fake_response
+
+
+@pytest.fixture(scope="session")
+def stub_parser():
+    """Provide the parser stand-in builder used to bypass document parsing.
+
+    Returns:
+        (Callable[[Dict[str, Any]], SimpleNamespace]):
+            ``_stub_parser``, taking the structure the stub's ``parse`` returns.
+    """
+    return _stub_parser
+
+
+@pytest.fixture(scope="session")
+def html_sample(tmp_path_factory):
+    """Write the sample HTML document once per session.
+
+    Returns:
+        (str):
+            Path to the sample ``.html`` file.
+    """
+    path = tmp_path_factory.mktemp("html") / "sample.html"
+    path.write_text(HTML_SAMPLE)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def latex_sample(tmp_path_factory):
+    """Write the sample LaTeX document once per session.
+
+    Returns:
+        (str):
+            Path to the sample ``.tex`` file.
+    """
+    path = tmp_path_factory.mktemp("latex") / "sample.tex"
+    path.write_text(LATEX_SAMPLE)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def docx_parser():
+    """Provide a DocxParser instance shared by the whole session.
+
+    Returns:
+        (DocxParser):
+            Parser for ``.docx`` files.
+    """
+    return DocxParser()
+
+
+@pytest.fixture(scope="session")
+def html_parser():
+    """Provide an HTMLParser instance shared by the whole session.
+
+    Returns:
+        (HTMLParser):
+            Parser for ``.html`` and ``.htm`` files.
+    """
+    return HTMLParser()
+
+
+@pytest.fixture(scope="session")
+def latex_parser():
+    """Provide a LaTeXParser instance shared by the whole session.
+
+    Returns:
+        (LaTeXParser):
+            Parser for ``.tex`` and ``.latex`` files.
+    """
+    return LaTeXParser()
+
+
+@pytest.fixture(scope="session")
+def html_parsed(html_parser, html_sample):
+    """Parse the sample HTML document once per session.
+
+    Returns:
+        (Dict[str, Any]):
+            Structure returned by ``HTMLParser.parse``.
+    """
+    return html_parser.parse(html_sample)
+
+
+@pytest.fixture(scope="session")
+def latex_parsed(latex_parser, latex_sample):
+    """Parse the sample LaTeX document once per session.
+
+    Returns:
+        (Dict[str, Any]):
+            Structure returned by ``LaTeXParser.parse``.
+    """
+    return latex_parser.parse(latex_sample)
+
+
+@pytest.fixture(scope="session")
+def cli_bytes():
+    """Read ``docx_tex_validator/cli.py`` once per session.
+
+    Returns:
+        (bytes):
+            Undecoded source of the CLI module.
+    """
+    return _CLI_PATH.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def docs_conf_bytes():
+    """Read ``docs/conf.py`` once per session.
+
+    Returns:
+        (bytes):
+            Undecoded source of the Sphinx configuration.
+    """
+    return _DOCS_CONF_PATH.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def pyproject_text():
+    """Read ``pyproject.toml`` once per session.
+
+    Returns:
+        (str):
+            Contents of the project metadata file.
+    """
+    return _PYPROJECT_PATH.read_text()
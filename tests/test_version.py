@@ -3,97 +3,72 @@ Tests for version consistency across the package.
 """
 
 import re
-from pathlib import Path
 
+import pytest
 
-def _get_version_from_init():
-    """Helper function to extract version from __init__.py."""
-    init_path = Path(__file__).parent.parent / "docx_tex_validator" / "__init__.py"
-    init_content = init_path.read_text()
+from docx_tex_validator import __version__
 
-    # Extract __version__ value
-    version_match = re.search(r'__version__\s*=\s*["\']([^"\']+)["\']', init_content)
-    if version_match is None:
-        raise ValueError("__version__ not found in __init__.py")
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    tomllib = None
 
-    return version_match.group(1)
-
-
-def test_version_defined():
-    """Test that __version__ is defined in the package."""
-    version = _get_version_from_init()
-
-    assert version is not None
-    assert len(version) > 0
+# Semantic Versioning 2.0.0 pattern from semver.org, without the named groups
+_SEMVER_RE = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*)?"
+    r"(?:\+[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*)?$"
+)
 
 
 def test_version_format():
-    """Test that version follows semantic versioning format."""
-    version = _get_version_from_init()
-
-    # Simple semantic versioning pattern
-    pattern = r"^\d+\.\d+\.\d+(?:-[a-zA-Z0-9.]+)?(?:\+[a-zA-Z0-9.]+)?$"
-    assert re.match(pattern, version), f"Version '{version}' does not match semantic versioning"
+    """Test that __version__ is defined and follows semantic versioning format."""
+    assert __version__, "__version__ is empty"
+    assert _SEMVER_RE.match(__version__), (
+        f"Version '{__version__}' does not match semantic versioning"
+    )
 
 
-def test_cli_uses_package_version():
+def test_cli_uses_package_version(cli_bytes):
     """Test that CLI imports version from the package."""
-    # Read cli.py to check it imports __version__
-    cli_path = Path(__file__).parent.parent / "docx_tex_validator" / "cli.py"
-    cli_content = cli_path.read_text()
-
     # Check that cli.py imports __version__
-    assert (
-        "from . import __version__" in cli_content
-        or "from docx_tex_validator import __version__" in cli_content
-    )
+    imports = (b"from . import __version__", b"from docx_tex_validator import __version__")
+    assert any(token in cli_bytes for token in imports), "cli.py does not import __version__"
     # Check that cli.py uses __version__ instead of a hardcoded string
-    assert "@click.version_option(version=__version__)" in cli_content
-
+    assert b"@click.version_option(version=__version__)" in cli_bytes
 
-def test_docs_conf_imports_version():
-    """Test that docs/conf.py imports version from the package."""
-    docs_conf_path = Path(__file__).parent.parent / "docs" / "conf.py"
-    conf_content = docs_conf_path.read_text()
 
-    # Check that conf.py imports __version__
-    assert "from docx_tex_validator import __version__" in conf_content
-    # Check that it uses __version__ for release and version
-    assert "release = __version__" in conf_content
-    assert "version = __version__" in conf_content
+def test_docs_conf_imports_version(docs_conf_bytes):
+    """Test that docs/conf.py imports version from the package and uses it."""
+    required = (
+        b"from docx_tex_validator import __version__",
+        b"release = __version__",
+        b"version = __version__",
+    )
+    missing = [token for token in required if token not in docs_conf_bytes]
+    assert not missing, f"docs/conf.py is missing: {missing}"
 
 
-def test_pyproject_uses_dynamic_version():
+def test_pyproject_uses_dynamic_version(pyproject_text):
     """Test that pyproject.toml uses dynamic versioning."""
-    pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
-    pyproject_content = pyproject_path.read_text()
+    toml = tomllib or pytest.importorskip("tomli")
+    data = toml.loads(pyproject_text)
+    project = data["project"]
 
-    # Check that version is in the dynamic list using regex
-    dynamic_version_pattern = r'dynamic\s*=\s*\[.*["\']version["\'].*\]'
-    assert re.search(dynamic_version_pattern, pyproject_content), (
+    # Check that version is in the dynamic list in [project]
+    assert "version" in project.get("dynamic", []), (
         "Version should be in the dynamic list in [project] section"
     )
 
     # Check that version is NOT hardcoded in [project] section
-    lines = pyproject_content.split("\n")
-    in_project_section = False
-    for line in lines:
-        if line.strip() == "[project]":
-            in_project_section = True
-        elif line.strip().startswith("[") and line.strip() != "[project]":
-            in_project_section = False
-        elif in_project_section and re.match(r'^\s*version\s*=\s*["\']', line):
-            assert False, "Version should not be hardcoded in [project] section"
-
-    # Check that setuptools.dynamic configuration exists
-    assert "[tool.setuptools.dynamic]" in pyproject_content
-    setuptools_dynamic_pattern = r"version\s*=\s*\{.*attr.*docx_tex_validator\.__version__.*\}"
-    assert re.search(setuptools_dynamic_pattern, pyproject_content), (
+    assert "version" not in project, "Version should not be hardcoded in [project] section"
+
+    # Check that setuptools.dynamic configures the version from the package
+    dynamic = data.get("tool", {}).get("setuptools", {}).get("dynamic", {})
+    assert dynamic.get("version", {}).get("attr") == "docx_tex_validator.__version__", (
         "setuptools.dynamic should configure version from docx_tex_validator.__version__"
     )
 
 
 if __name__ == "__main__":
-    import pytest
-
     pytest.main([__file__, "-v"])